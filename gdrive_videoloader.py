@@ -12,6 +12,14 @@ import os
 import json
 import re
 import time
+import hashlib
+import queue
+import shlex
+import subprocess
+import threading
+import struct
+import bisect
+import math
 
 def extract_video_id(url: str) -> str:
     """Extract video ID from Google Drive URL or return as-is if already an ID."""
@@ -497,12 +505,350 @@ def get_optimal_chunk_size(file_size: int, user_chunk_size: int = None) -> int:
     else:  # >= 500MB
         return 1024 * 1024  # 1MB
 
-def download_file(url: str, cookies: dict, filename: str, chunk_size: int, verbose: bool) -> None:
-    """Downloads the file from the given URL with provided cookies, supports resuming."""
+class StreamProcessor:
+    """Post-processing stage fed with downloaded bytes while the download runs.
+
+    Each processor drains its own bounded queue on a worker thread. When the
+    queue is full, feed() blocks, so a slow consumer throttles the download
+    instead of buffering the whole file in memory.
+    """
+
+    label = "processor"
+
+    def __init__(self, max_pending: int = 64):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+        self._aborted = False
+        self.error = None
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        self._thread = threading.Thread(target=self._run, name=self.label, daemon=True)
+        self._thread.start()
+
+    def feed(self, chunk: bytes) -> None:
+        """Queue a chunk for processing, blocking while the queue is full."""
+        self._queue.put(chunk)
+
+    def finish(self) -> bool:
+        """Signal end of stream, wait for the worker and return True on success."""
+        if self._thread is None:
+            return self.error is None
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        return self.error is None
+
+    def abort(self) -> None:
+        """Stop processing after a failed download and discard queued data."""
+        if self._thread is None:
+            return
+        self._aborted = True
+        self.cancel()
+        self.finish()
+
+    def _run(self) -> None:
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                break
+            # Keep draining after an error so the producer never blocks forever
+            if self.error is not None or self._aborted:
+                continue
+            try:
+                self.process(chunk)
+            except Exception as e:
+                self.error = e
+                self.cancel()
+        if self.error is None and not self._aborted:
+            try:
+                self.finalize()
+            except Exception as e:
+                self.error = e
+
+    def process(self, chunk: bytes) -> None:
+        """Consume one chunk of the downloaded stream."""
+        raise NotImplementedError
+
+    def finalize(self) -> None:
+        """Called once after the last chunk of a successful download."""
+
+    def cancel(self) -> None:
+        """Release resources early when processing is abandoned."""
+
+    def report(self) -> str:
+        """Return a one-line summary printed after a successful download."""
+        return f"{self.label} finished"
+
+# SHAKE digests need an explicit length, so they are not offered
+HASH_ALGORITHMS = sorted(name for name in hashlib.algorithms_guaranteed if not name.startswith('shake_'))
+
+class HashProcessor(StreamProcessor):
+    """Computes a digest of the downloaded file as it arrives."""
+
+    def __init__(self, algorithm: str = "sha256", max_pending: int = 64):
+        super().__init__(max_pending)
+        self.label = f"hash:{algorithm}"
+        self._hash = hashlib.new(algorithm)
+        self.digest = None
+
+    def process(self, chunk: bytes) -> None:
+        self._hash.update(chunk)
+
+    def finalize(self) -> None:
+        self.digest = self._hash.hexdigest()
+
+    def report(self) -> str:
+        return f"{self._hash.name}: {self.digest}"
+
+class PipeProcessor(StreamProcessor):
+    """Pipes the downloaded stream into the stdin of an external command.
+
+    Useful for ffmpeg remuxing/segmenting or uploaders that read from stdin,
+    e.g. "ffmpeg -i pipe:0 -c copy -f hls out.m3u8".
+    """
+
+    def __init__(self, command: str, verbose: bool = False, max_pending: int = 64):
+        super().__init__(max_pending)
+        self.label = f"pipe:{command}"
+        self.command = command
+        self.verbose = verbose
+        self._process = None
+
+    def start(self) -> None:
+        # Spawn here so a missing executable fails before the download begins
+        self._process = subprocess.Popen(
+            shlex.split(self.command),
+            stdin=subprocess.PIPE,
+            stdout=None if self.verbose else subprocess.DEVNULL,
+            stderr=None if self.verbose else subprocess.DEVNULL
+        )
+        super().start()
+
+    def process(self, chunk: bytes) -> None:
+        self._process.stdin.write(chunk)
+
+    def finalize(self) -> None:
+        self._process.stdin.close()
+        return_code = self._process.wait()
+        if return_code != 0:
+            raise RuntimeError(f"command exited with status {return_code}")
+
+    def cancel(self) -> None:
+        if self._process and self._process.poll() is None:
+            try:
+                self._process.kill()
+                self._process.wait()
+            except Exception:
+                pass
+
+    def report(self) -> str:
+        return f"'{self.command}' completed"
+
+def build_processors(pipe_commands: list = None, hash_algorithms: list = None, verbose: bool = False) -> list:
+    """Create post-processing stages from command-line options."""
+    processors = []
+    for algorithm in hash_algorithms or []:
+        processors.append(HashProcessor(algorithm))
+    for command in pipe_commands or []:
+        processors.append(PipeProcessor(command, verbose))
+    return processors
+
+def start_processors(processors: list) -> bool:
+    """Start all processors; on failure stop the ones already running."""
+    started = []
+    for processor in processors:
+        try:
+            processor.start()
+        except Exception as e:
+            print(f"\n[ERROR] Could not start post-processor {processor.label}: {e}")
+            for running in started:
+                running.abort()
+            return False
+        started.append(processor)
+    return True
+
+def feed_processors(processors: list, chunk: bytes) -> None:
+    """Tee a downloaded chunk into every processor."""
+    for processor in processors:
+        processor.feed(chunk)
+
+def replay_partial_file(filename: str, start: int, end: int, processors: list, chunk_size: int) -> int:
+    """Feed bytes start..end already on disk so processors see the whole file.
+
+    Returns the number of bytes the processors have received afterwards.
+    """
+    if not processors or end <= start:
+        return max(start, end)
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            feed_processors(processors, chunk)
+            remaining -= len(chunk)
+    return end - remaining
+
+def finish_processors(processors: list) -> bool:
+    """Wait for all processors to drain and report their results."""
+    success = True
+    for processor in processors:
+        if processor.finish():
+            print(f"[POSTPROCESS] {processor.report()}")
+        else:
+            print(f"\n[ERROR] Post-processor {processor.label} failed: {processor.error}")
+            success = False
+    return success
+
+def abort_processors(processors: list) -> None:
+    """Stop all processors after a failed download."""
+    for processor in processors:
+        processor.abort()
+
+def create_session() -> requests.Session:
+    """Create a requests session with retry strategy."""
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"]
+    )
+    adapter = HTTPAdapter(max_retries=retry_strategy)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+FSYNC_POLICIES = ("none", "periodic", "at-end")
+
+class WriteBehindWriter:
+    """Writes downloaded buffers to disk on a dedicated thread.
+
+    The network loop hands buffers to a bounded queue and keeps reading while
+    the writer thread drains it with positional writes, so a slow disk only
+    stalls the socket once the buffer limit is reached.
+    """
+
+    def __init__(self, filename: str, offset: int = 0, truncate: bool = False, fsync_policy: str = "none",
+                 max_buffered_bytes: int = 64 * 1024 * 1024, chunk_size: int = 65536,
+                 fsync_interval: int = 64 * 1024 * 1024):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync_policy}")
+        flags = os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        if truncate:
+            flags |= os.O_TRUNC
+        self.filename = filename
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.max_pending = max(1, max_buffered_bytes // max(1, chunk_size))
+        self.error = None
+        self._fd = os.open(filename, flags, 0o666)
+        self._offset = offset
+        self._unsynced = 0
+        self._queue = queue.Queue(maxsize=self.max_pending)
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        # Queue-depth metrics, sampled on every write()
+        self.buffers_written = 0
+        self.bytes_written = 0
+        self.fsync_count = 0
+        self.max_depth = 0
+        self._depth_total = 0
+        self.stall_time = 0.0
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def write(self, chunk: bytes) -> None:
+        """Queue a buffer at the next file offset, blocking only when the queue is full."""
+        if self.error is not None:
+            raise self.error
+        depth = self._queue.qsize()
+        self._depth_total += depth
+        self.max_depth = max(self.max_depth, depth)
+        self.buffers_written += 1
+        try:
+            self._queue.put_nowait((self._offset, chunk))
+        except queue.Full:
+            stall_start = time.time()
+            self._queue.put((self._offset, chunk))
+            self.stall_time += time.time() - stall_start
+        self._offset += len(chunk)
+
+    def close(self) -> None:
+        """Flush queued buffers, apply the fsync policy and close the file."""
+        if self._fd is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        try:
+            if self.error is None and self.fsync_policy != "none" and self._unsynced:
+                os.fsync(self._fd)
+                self.fsync_count += 1
+        finally:
+            os.close(self._fd)
+            self._fd = None
+        if self.error is not None:
+            raise self.error
+
+    def _pwrite(self, data: bytes, offset: int) -> None:
+        if hasattr(os, 'pwrite'):
+            while data:
+                written = os.pwrite(self._fd, data, offset)
+                data = data[written:]
+                offset += written
+        else:
+            # Windows has no pwrite; only this thread touches the descriptor
+            os.lseek(self._fd, offset, os.SEEK_SET)
+            while data:
+                written = os.write(self._fd, data)
+                data = data[written:]
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            # Keep draining after an error so the network loop never blocks forever
+            if self.error is not None:
+                continue
+            offset, chunk = item
+            try:
+                self._pwrite(chunk, offset)
+                self.bytes_written += len(chunk)
+                self._unsynced += len(chunk)
+                if self.fsync_policy == "periodic" and self._unsynced >= self.fsync_interval:
+                    os.fsync(self._fd)
+                    self.fsync_count += 1
+                    self._unsynced = 0
+            except OSError as e:
+                self.error = e
+
+    def report(self) -> str:
+        """Return a summary of queue-depth metrics."""
+        average_depth = self._depth_total / self.buffers_written if self.buffers_written else 0.0
+        return (f"write queue depth avg {average_depth:.1f}, max {self.max_depth}/{self.max_pending} buffers, "
+                f"network stalled {self.stall_time:.2f}s, {self.fsync_count} fsync(s)")
+
+def download_file(url: str, cookies: dict, filename: str, chunk_size: int, verbose: bool, processors: list = None,
+                  fsync_policy: str = "none", write_buffer: int = 64 * 1024 * 1024) -> bool:
+    """Downloads the file from the given URL with provided cookies, supports resuming.
+
+    Downloaded bytes are also fed to any post-processors as they arrive, and
+    written to disk through a write-behind thread holding at most
+    write_buffer bytes.
+    Returns True if the download completed.
+    """
+    processors = processors or []
     # Validate filename
     if not filename:
         print("\n[ERROR] Filename is required for download.")
-        return
+        return False
     
     headers = {
         'Accept-Encoding': 'gzip, deflate',
@@ -521,20 +867,12 @@ def download_file(url: str, cookies: dict, filename: str, chunk_size: int, verbo
         if downloaded_size > 0:
             print(f"[INFO] Resuming download from byte {downloaded_size}")
 
-    # Create session with retry strategy
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET"]
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
+    session = create_session()
 
     max_retries = 3
     retry_count = 0
+    # Bytes of the file already fed to processors; a retry must not feed them twice
+    processed_size = 0
     
     while retry_count < max_retries:
         try:
@@ -557,7 +895,18 @@ def download_file(url: str, cookies: dict, filename: str, chunk_size: int, verbo
                     if verbose:
                         print(f"[INFO] Using custom chunk size: {optimal_chunk_size // 1024}KB")
                 
-                with open(filename, file_mode) as file:
+                processed_size = replay_partial_file(filename, processed_size, downloaded_size, processors, optimal_chunk_size)
+                position = downloaded_size
+
+                writer = WriteBehindWriter(
+                    filename,
+                    offset=downloaded_size,
+                    truncate=(file_mode == 'wb'),
+                    fsync_policy=fsync_policy,
+                    max_buffered_bytes=write_buffer,
+                    chunk_size=optimal_chunk_size
+                )
+                with writer:
                     with tqdm(
                         total=total_size,
                         initial=downloaded_size,
@@ -570,21 +919,30 @@ def download_file(url: str, cookies: dict, filename: str, chunk_size: int, verbo
                     ) as pbar:
                         for chunk in response.iter_content(chunk_size=optimal_chunk_size):
                             if chunk:
-                                file.write(chunk)
+                                writer.write(chunk)
+                                chunk_end = position + len(chunk)
+                                if chunk_end > processed_size:
+                                    feed_processors(processors, chunk[max(0, processed_size - position):])
+                                    processed_size = chunk_end
+                                position = chunk_end
                                 pbar.update(len(chunk))
                 
                 print(f"\n{filename} downloaded successfully.")
-                return  # Success, exit retry loop
+                if verbose:
+                    print(f"[INFO] {writer.report()}")
+                if processors and not finish_processors(processors):
+                    return False
+                return True  # Success, exit retry loop
                 
             elif response.status_code == 403:
                 print(f"\n[ERROR] Access denied (403) while downloading {filename}.")
                 print("  - Video may require authentication")
                 print("  - Cookies may have expired")
                 print("  - Your account may not have download permission")
-                return
+                return False
             elif response.status_code == 404:
                 print(f"\n[ERROR] Video not found (404). The download URL may have expired.")
-                return
+                return False
             else:
                 print(f"\n[ERROR] Failed to download {filename}, status code: {response.status_code}")
                 retry_count += 1
@@ -593,7 +951,7 @@ def download_file(url: str, cookies: dict, filename: str, chunk_size: int, verbo
                     print(f"Retrying in {wait_time} seconds... (attempt {retry_count + 1}/{max_retries})")
                     time.sleep(wait_time)
                 else:
-                    return
+                    return False
                     
         except requests.exceptions.Timeout:
             retry_count += 1
@@ -605,7 +963,7 @@ def download_file(url: str, cookies: dict, filename: str, chunk_size: int, verbo
                 print(f"\n[ERROR] Download timeout after {max_retries} attempts.")
                 print("  - Check your internet connection")
                 print("  - Try again later")
-                return
+                return False
         except requests.exceptions.RequestException as e:
             retry_count += 1
             if retry_count < max_retries:
@@ -617,12 +975,655 @@ def download_file(url: str, cookies: dict, filename: str, chunk_size: int, verbo
                 print(f"\n[ERROR] Network error after {max_retries} attempts: {e}")
                 print("  - Check your internet connection")
                 print("  - Verify the video URL is accessible")
-                return
+                return False
+        except OSError as e:
+            # Disk errors surfaced by the write-behind thread (ENOSPC, EIO, ...)
+            print(f"\n[ERROR] Failed to write {filename}: {e}")
+            print("  - Check that there is enough free disk space")
+            print("  - Verify you have write permission for the output location")
+            return False
         finally:
             session.close()
 
-def main(video_id: str, output_file: str = None, chunk_size: int = 65536, verbose: bool = False, cookie_file: str = None) -> None:
-    """Main function to process video ID and download the video file."""
+CLIP_MERGE_GAP = 256 * 1024  # Fetch small gaps between needed samples instead of issuing another request
+RANGE_HEADERS = {
+    'Accept-Encoding': 'identity',
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+class ClipError(Exception):
+    """Raised when a time-range clip cannot be produced from the remote file."""
+
+def parse_timestamp(value: str) -> float:
+    """Parse 'SS', 'MM:SS' or 'HH:MM:SS' (fractions allowed) into seconds."""
+    parts = value.strip().split(':')
+    if len(parts) > 3:
+        raise ValueError(f"invalid timestamp: {value}")
+    seconds = 0.0
+    for position, part in enumerate(parts):
+        number = float(part)
+        if not math.isfinite(number) or number < 0:
+            raise ValueError(f"invalid timestamp: {value}")
+        # Minutes and seconds fields must be below 60 when a larger unit precedes them
+        if position > 0 and number >= 60:
+            raise ValueError(f"invalid timestamp: {value}")
+        seconds = seconds * 60 + number
+    return seconds
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds as HH:MM:SS.mmm."""
+    minutes, secs = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
+
+def format_clip_label(seconds: float) -> str:
+    """Format a clip boundary for use in a filename, e.g. 01h05m30s or 00h00m10.500s ('end' for None)."""
+    if seconds is None:
+        return "end"
+    milliseconds = round(seconds * 1000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    hours, minutes = divmod(minutes, 60)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    if milliseconds:
+        return f"{hours:02d}h{minutes:02d}m{secs:02d}.{milliseconds:03d}s"
+    return f"{hours:02d}h{minutes:02d}m{secs:02d}s"
+
+def fetch_range(session: requests.Session, url: str, cookies: dict, start: int, end: int) -> tuple[bytes, int]:
+    """Fetch bytes start..end (inclusive) and return them with the total file size."""
+    headers = dict(RANGE_HEADERS, Range=f"bytes={start}-{end}")
+    # Stream so a server that ignores Range never has its whole body read into memory
+    with session.get(url, stream=True, cookies=cookies, headers=headers, timeout=60) as response:
+        if response.status_code == 200:
+            raise ClipError("server does not support range requests")
+        if response.status_code != 206:
+            raise ClipError(f"range request failed with status code {response.status_code}")
+        content_range = response.headers.get('content-range', '')
+        match = re.match(r'bytes \d+-\d+/(\d+)', content_range)
+        if not match:
+            raise ClipError("server did not report the file size for range requests")
+        return response.content, int(match.group(1))
+
+def read_box_header(data: bytes, offset: int) -> tuple[str, int, int]:
+    """Return (type, header size, box size) of the MP4 box at offset. Size 0 means 'to end of file'."""
+    size, box_type = struct.unpack_from('>I4s', data, offset)
+    header_size = 8
+    if size == 1:
+        size = struct.unpack_from('>Q', data, offset + 8)[0]
+        header_size = 16
+    return box_type.decode('latin-1'), header_size, size
+
+def iter_boxes(data: bytes, start: int = 0, end: int = None):
+    """Yield (type, box start, payload start, box end) for boxes in data[start:end]."""
+    end = len(data) if end is None else end
+    offset = start
+    while offset + 8 <= end:
+        box_type, header_size, size = read_box_header(data, offset)
+        if size == 0:
+            size = end - offset
+        if size < header_size or offset + size > end:
+            raise ClipError(f"malformed '{box_type}' box")
+        yield box_type, offset, offset + header_size, offset + size
+        offset += size
+
+def find_box(data: bytes, start: int, end: int, box_type: str) -> tuple[int, int]:
+    """Return (payload start, box end) of the first child box of the given type."""
+    for child_type, _, payload_start, box_end in iter_boxes(data, start, end):
+        if child_type == box_type:
+            return payload_start, box_end
+    return None
+
+def make_box(box_type: str, payload: bytes) -> bytes:
+    """Serialize an MP4 box."""
+    return struct.pack('>I4s', 8 + len(payload), box_type.encode('latin-1')) + payload
+
+def make_full_box(box_type: str, version: int, payload: bytes) -> bytes:
+    """Serialize an MP4 full box (version + zero flags)."""
+    return make_box(box_type, struct.pack('>I', version << 24) + payload)
+
+def fetch_mp4_index(session: requests.Session, url: str, cookies: dict) -> tuple[bytes, bytes]:
+    """Walk top-level boxes with small Range requests and return the raw ftyp and moov boxes."""
+    ftyp = b''
+    offset = 0
+    file_size = None
+    while file_size is None or offset < file_size:
+        header, file_size = fetch_range(session, url, cookies, offset, offset + 15)
+        if len(header) < 8:
+            break
+        box_type, header_size, size = read_box_header(header, 0)
+        if size == 0:
+            size = file_size - offset
+        if size < header_size:
+            raise ClipError(f"malformed '{box_type}' box at byte {offset}")
+        if box_type == 'moof':
+            raise ClipError("fragmented MP4 files are not supported")
+        if box_type in ('ftyp', 'moov'):
+            data, _ = fetch_range(session, url, cookies, offset, offset + size - 1)
+            if box_type == 'moov':
+                return ftyp, data
+            ftyp = data
+        offset += size
+    raise ClipError("no 'moov' box found (is this an MP4 file?)")
+
+def read_table(data: bytes, box: tuple[int, int], entry_format: str) -> list:
+    """Read the entries of a full box laid out as entry_count followed by entries."""
+    payload_start, box_end = box
+    count = struct.unpack_from('>I', data, payload_start + 4)[0]
+    entry_size = struct.calcsize(entry_format)
+    start = payload_start + 8
+    if start + count * entry_size > box_end:
+        raise ClipError("malformed MP4 index (table larger than its box)")
+    return list(struct.iter_unpack(entry_format, data[start:start + count * entry_size]))
+
+def read_sample_sizes(data: bytes, stbl: dict, sample_count: int) -> list:
+    """Return per-sample sizes from stsz or stz2, which must list sample_count samples."""
+    if 'stsz' in stbl:
+        payload_start, box_end = stbl['stsz']
+        sample_size, count = struct.unpack_from('>II', data, payload_start + 4)
+        if count != sample_count:
+            raise ClipError("malformed MP4 index (sample tables disagree)")
+        if sample_size:
+            return [sample_size] * count
+        if payload_start + 12 + count * 4 > box_end:
+            raise ClipError("malformed MP4 index (table larger than its box)")
+        return list(struct.unpack_from(f'>{count}I', data, payload_start + 12))
+    if 'stz2' in stbl:
+        payload_start, box_end = stbl['stz2']
+        field_size = data[payload_start + 7]
+        count = struct.unpack_from('>I', data, payload_start + 8)[0]
+        if count != sample_count:
+            raise ClipError("malformed MP4 index (sample tables disagree)")
+        start = payload_start + 12
+        if field_size not in (4, 8, 16) or start + (count * field_size + 7) // 8 > box_end:
+            raise ClipError("malformed MP4 index (table larger than its box)")
+        if field_size == 16:
+            return list(struct.unpack_from(f'>{count}H', data, start))
+        if field_size == 8:
+            return list(data[start:start + count])
+        sizes = []
+        for byte in data[start:start + (count + 1) // 2]:
+            sizes.extend((byte >> 4, byte & 0x0F))
+        return sizes[:count]
+    raise ClipError("track has no sample size table")
+
+def parse_track(moov: bytes, trak: tuple[int, int]) -> dict:
+    """Expand a trak's sample tables into per-sample lists."""
+    mdia = find_box(moov, *trak, 'mdia')
+    minf = mdia and find_box(moov, *mdia, 'minf')
+    stbl_box = minf and find_box(moov, *minf, 'stbl')
+    mdhd = mdia and find_box(moov, *mdia, 'mdhd')
+    hdlr = mdia and find_box(moov, *mdia, 'hdlr')
+    if not (stbl_box and mdhd and hdlr):
+        raise ClipError("track is missing its media header or sample table")
+
+    version = moov[mdhd[0]]
+    timescale = struct.unpack_from('>I', moov, mdhd[0] + (20 if version == 1 else 12))[0]
+    handler = moov[hdlr[0] + 8:hdlr[0] + 12].decode('latin-1')
+    stbl = {box_type: (payload_start, box_end) for box_type, _, payload_start, box_end in iter_boxes(moov, *stbl_box)}
+    if 'stsd' not in stbl or 'stts' not in stbl or 'stsc' not in stbl:
+        raise ClipError(f"'{handler}' track has an incomplete sample table")
+
+    stts = read_table(moov, stbl['stts'], '>II')
+    # Counts are cross-checked before expanding so a corrupt one cannot allocate a huge list
+    sizes = read_sample_sizes(moov, stbl, sum(count for count, _ in stts))
+    durations = []
+    for count, delta in stts:
+        durations.extend([delta] * count)
+    decode_times = [0] * len(durations)
+    for i in range(1, len(durations)):
+        decode_times[i] = decode_times[i - 1] + durations[i - 1]
+
+    composition_offsets = None
+    ctts_version = 0
+    if 'ctts' in stbl:
+        ctts_version = moov[stbl['ctts'][0]]
+        ctts = read_table(moov, stbl['ctts'], '>Ii' if ctts_version == 1 else '>II')
+        if sum(count for count, _ in ctts) != len(sizes):
+            raise ClipError(f"malformed MP4 index ('{handler}' sample tables disagree)")
+        composition_offsets = []
+        for count, offset in ctts:
+            composition_offsets.extend([offset] * count)
+
+    sync_samples = None
+    if 'stss' in stbl:
+        sync_samples = [number - 1 for (number,) in read_table(moov, stbl['stss'], '>I')]
+        if any(not 0 <= number < len(sizes) for number in sync_samples):
+            raise ClipError(f"malformed MP4 index ('{handler}' sync sample out of range)")
+
+    if 'stco' in stbl:
+        chunk_offsets = [offset for (offset,) in read_table(moov, stbl['stco'], '>I')]
+    elif 'co64' in stbl:
+        chunk_offsets = [offset for (offset,) in read_table(moov, stbl['co64'], '>Q')]
+    else:
+        raise ClipError(f"'{handler}' track has no chunk offset table")
+
+    # Resolve sample-to-chunk runs into an absolute file offset per sample
+    offsets, description_indexes = [], []
+    stsc = read_table(moov, stbl['stsc'], '>III')
+    for i, (first_chunk, samples_per_chunk, description_index) in enumerate(stsc):
+        last_chunk = stsc[i + 1][0] - 1 if i + 1 < len(stsc) else len(chunk_offsets)
+        if first_chunk < 1 or last_chunk > len(chunk_offsets):
+            raise ClipError(f"malformed MP4 index ('{handler}' chunk table out of range)")
+        for chunk in range(first_chunk, last_chunk + 1):
+            offset = chunk_offsets[chunk - 1]
+            for _ in range(samples_per_chunk):
+                if len(offsets) >= len(sizes):
+                    break
+                offsets.append(offset)
+                description_indexes.append(description_index)
+                offset += sizes[len(offsets) - 1]
+
+    # Media time shown at presentation time zero, from the first non-empty edit
+    edit_offset = 0
+    edts = find_box(moov, *trak, 'edts')
+    elst = edts and find_box(moov, *edts, 'elst')
+    if elst:
+        entry_format = '>QqHH' if moov[elst[0]] == 1 else '>IiHH'
+        for _, media_time, _, _ in read_table(moov, elst, entry_format):
+            if media_time >= 0:
+                edit_offset = media_time
+                break
+
+    sample_count = min(len(sizes), len(durations), len(offsets))
+    return {
+        'handler': handler,
+        'timescale': timescale,
+        'edit_offset': edit_offset,
+        'stsd': moov[stbl['stsd'][0] - 8:stbl['stsd'][1]],
+        'sizes': sizes[:sample_count],
+        'durations': durations[:sample_count],
+        'decode_times': decode_times[:sample_count],
+        'composition_offsets': composition_offsets,
+        'ctts_version': ctts_version,
+        'sync_samples': sync_samples,
+        'offsets': offsets[:sample_count],
+        'description_indexes': description_indexes[:sample_count],
+    }
+
+def select_clip_samples(tracks: list, start: float, end: float) -> float:
+    """Pick each track's sample range covering start..end and return the actual clip start.
+
+    start and end are compared with video presentation times (decode time
+    plus composition offset) shifted by the media time of the track's first
+    non-empty edit; leading empty edits (track delays) are ignored. The clip
+    is widened to video sync samples on both sides (the last one at or before
+    start, the first one at or after end) so every frame decodes; without a
+    sync sample table every frame is a sync sample. Other tracks are cut at
+    the same points in time, or at start itself when it precedes the first
+    video frame. Each track's 'media_time' is set to the offset into its
+    first kept sample that lines up with the clip start, and 'delay' to how
+    long after the clip start its first sample is shown.
+    """
+    reference = next((track for track in tracks if track['handler'] == 'vide' and track['sizes']), None)
+    clip_start, clip_end = start, end
+    if reference:
+        timescale = reference['timescale']
+        edit_offset = reference['edit_offset']
+        decode_times = reference['decode_times']
+        composition_offsets = reference['composition_offsets']
+        sync_samples = reference['sync_samples']
+        if start * timescale >= sum(reference['durations']):
+            raise ClipError("start time is beyond the end of the video")
+
+        def presentation_time(i: int) -> int:
+            return decode_times[i] + (composition_offsets[i] if composition_offsets else 0)
+
+        target_start = start * timescale + edit_offset
+        target_end = None if end is None else end * timescale + edit_offset
+        if sync_samples is not None:
+            sync_times = [presentation_time(i) for i in sync_samples]
+            sync_position = bisect.bisect_right(sync_times, target_start) - 1
+            first = sync_samples[sync_position] if sync_position >= 0 else 0
+            sync_position = len(sync_times) if end is None else bisect.bisect_left(sync_times, target_end)
+            last = sync_samples[sync_position] if sync_position < len(sync_samples) else len(decode_times)
+        else:
+            # Every sample is a sync sample: cut at the frames shown at start and end
+            durations = reference['durations']
+            sample_count = len(decode_times)
+            first = next((i for i in range(sample_count) if presentation_time(i) + durations[i] > target_start), sample_count)
+            if first >= sample_count:
+                raise ClipError("start time is beyond the end of the video")
+            last = sample_count if end is None else \
+                next((i for i in range(first, sample_count) if presentation_time(i) >= target_end), sample_count)
+        clip_start = (presentation_time(first) - edit_offset) / timescale
+        clip_end = (presentation_time(last) - edit_offset) / timescale if last < len(decode_times) else None
+        reference['first'], reference['last'] = first, max(first, last)
+
+    # A start before the first video frame is shown (e.g. 0 with B-frame delay and
+    # no edit list) keeps the other tracks from the requested start; an empty
+    # edit on the video track then reproduces the delay instead of audio being trimmed
+    clip_start = min(start, clip_start)
+    for track in tracks:
+        timescale = track['timescale']
+        decode_times = track['decode_times']
+        media_start = round(clip_start * timescale) + track['edit_offset']
+        if track is not reference:
+            sample_ends = [t + d for t, d in zip(decode_times, track['durations'])]
+            first = bisect.bisect_right(sample_ends, media_start)
+            last = len(decode_times) if clip_end is None else \
+                bisect.bisect_left(decode_times, round(clip_end * timescale) + track['edit_offset'])
+            track['first'], track['last'] = first, max(first, last)
+        first, last = track['first'], track['last']
+        track['media_time'] = track['delay'] = 0
+        if first < last:
+            composition_offsets = track['composition_offsets']
+            first_shown = decode_times[first] + (composition_offsets[first] if composition_offsets else 0)
+            # Media starting after the clip start is delayed with an empty edit
+            track['delay'] = max(0, first_shown - media_start)
+            track['media_time'] = max(0, media_start + track['delay'] - decode_times[first])
+    if not any(track['last'] > track['first'] for track in tracks):
+        raise ClipError("no samples fall inside the requested time range")
+    return clip_start
+
+def layout_clip(tracks: list) -> tuple[list, int]:
+    """Order selected samples by source offset and group them into output chunks.
+
+    Returns the source byte pieces to copy (contiguous samples coalesced) and
+    the total mdat payload size. Chunk layout is stored on each track.
+    """
+    samples = []
+    for track_index, track in enumerate(tracks):
+        track['chunks'] = []
+        for i in range(track['first'], track['last']):
+            samples.append((track['offsets'][i], track['sizes'][i], track_index, i))
+    samples.sort()
+
+    pieces = []
+    position = 0
+    previous_key = None
+    for source_offset, size, track_index, i in samples:
+        track = tracks[track_index]
+        key = (track_index, track['description_indexes'][i])
+        if key == previous_key:
+            track['chunks'][-1][1] += 1
+        else:
+            track['chunks'].append([position, 1, key[1]])
+            previous_key = key
+        if pieces and pieces[-1][1] == source_offset:
+            pieces[-1][1] += size
+        else:
+            pieces.append([source_offset, source_offset + size])
+        position += size
+    return pieces, position
+
+def build_sample_table(track: dict, mdat_offset: int, use_co64: bool) -> bytes:
+    """Serialize a stbl box describing the selected samples of a track.
+
+    Other sample-indexed boxes (sdtp, sbgp, subs, ...) are dropped since their
+    entries refer to the original sample numbering.
+    """
+    first, last = track['first'], track['last']
+    boxes = [track['stsd']]
+
+    stts = []
+    for duration in track['durations'][first:last]:
+        if stts and stts[-1][1] == duration:
+            stts[-1][0] += 1
+        else:
+            stts.append([1, duration])
+    boxes.append(make_full_box('stts', 0, struct.pack('>I', len(stts)) + b''.join(struct.pack('>II', *e) for e in stts)))
+
+    if track['composition_offsets'] is not None:
+        ctts = []
+        for offset in track['composition_offsets'][first:last]:
+            if ctts and ctts[-1][1] == offset:
+                ctts[-1][0] += 1
+            else:
+                ctts.append([1, offset])
+        entry_format = '>Ii' if track['ctts_version'] == 1 else '>II'
+        boxes.append(make_full_box('ctts', track['ctts_version'],
+                                   struct.pack('>I', len(ctts)) + b''.join(struct.pack(entry_format, *e) for e in ctts)))
+
+    if track['sync_samples'] is not None:
+        sync = [i - first + 1 for i in track['sync_samples'] if first <= i < last]
+        boxes.append(make_full_box('stss', 0, struct.pack(f'>I{len(sync)}I', len(sync), *sync)))
+
+    sizes = track['sizes'][first:last]
+    boxes.append(make_full_box('stsz', 0, struct.pack(f'>II{len(sizes)}I', 0, len(sizes), *sizes)))
+
+    stsc = []
+    for number, (_, count, description_index) in enumerate(track['chunks'], 1):
+        if not stsc or stsc[-1][1:] != (count, description_index):
+            stsc.append((number, count, description_index))
+    boxes.append(make_full_box('stsc', 0, struct.pack('>I', len(stsc)) + b''.join(struct.pack('>III', *e) for e in stsc)))
+
+    offsets = [mdat_offset + chunk[0] for chunk in track['chunks']]
+    if use_co64:
+        boxes.append(make_full_box('co64', 0, struct.pack(f'>I{len(offsets)}Q', len(offsets), *offsets)))
+    else:
+        boxes.append(make_full_box('stco', 0, struct.pack(f'>I{len(offsets)}I', len(offsets), *offsets)))
+    return make_box('stbl', b''.join(boxes))
+
+def patch_duration(payload: bytes, duration: int, v0_offset: int, v1_offset: int) -> bytes:
+    """Return a copy of an mvhd/tkhd/mdhd payload with its duration field replaced."""
+    payload = bytearray(payload)
+    if payload[0] == 1:
+        struct.pack_into('>Q', payload, v1_offset, duration)
+    else:
+        struct.pack_into('>I', payload, v0_offset, min(duration, 0xFFFFFFFF))
+    return bytes(payload)
+
+def build_edit_list(segment_duration: int, media_time: int, empty_duration: int = 0) -> bytes:
+    """Serialize an edts box that starts the track at media_time after an optional empty edit.
+
+    This hides B-frame composition delay and the part of the first audio
+    sample that precedes the clip start, while the empty edit keeps a track
+    that starts later than the clip (e.g. delayed video) in sync.
+    """
+    entries = ([(empty_duration, -1)] if empty_duration > 0 else []) + [(segment_duration, media_time)]
+    if any(duration > 0xFFFFFFFF or time > 0x7FFFFFFF for duration, time in entries):
+        entry_format, version = '>QqHH', 1
+    else:
+        entry_format, version = '>IiHH', 0
+    payload = struct.pack('>I', len(entries)) + b''.join(struct.pack(entry_format, duration, time, 1, 0)
+                                                        for duration, time in entries)
+    return make_box('edts', make_full_box('elst', version, payload))
+
+def build_clip_moov(moov: bytes, tracks: list, mdat_offset: int, use_co64: bool) -> bytes:
+    """Rebuild the moov box for the clip, keeping everything not tied to sample numbering."""
+    mvhd = find_box(moov, 8, len(moov), 'mvhd')
+    if not mvhd:
+        raise ClipError("movie header (mvhd) not found")
+    movie_timescale = struct.unpack_from('>I', moov, mvhd[0] + (20 if moov[mvhd[0]] == 1 else 12))[0]
+    track_durations = []
+    for track in tracks:
+        first, last = track['first'], track['last']
+        media_duration = sum(track['durations'][first:last])
+        track['media_duration'] = media_duration
+        # Composition offsets can push the last presented frame past the decode end
+        media_end = media_duration
+        if track['composition_offsets'] is not None and last > first:
+            start_time = track['decode_times'][first]
+            media_end = max(track['decode_times'][i] + track['composition_offsets'][i] + track['durations'][i]
+                            for i in range(first, last)) - start_time
+        segment_duration = max(0, media_end - track['media_time'])
+        track['presentation_duration'] = track['delay'] + segment_duration
+        if track['timescale']:
+            track['empty_duration'] = round(track['delay'] * movie_timescale / track['timescale'])
+            track['segment_duration'] = round(segment_duration * movie_timescale / track['timescale'])
+        else:
+            track['empty_duration'] = track['segment_duration'] = 0
+        track_durations.append(track['empty_duration'] + track['segment_duration'])
+
+    trak_count = 0
+
+    def rebuild(start: int, end: int, box_type: str, track_index: int = None) -> bytes:
+        nonlocal trak_count
+        track = tracks[track_index] if track_index is not None else None
+        children = []
+        for child_type, box_start, payload_start, box_end in iter_boxes(moov, start, end):
+            payload = moov[payload_start:box_end]
+            if child_type == 'mvhd':
+                children.append(make_box(child_type, patch_duration(payload, max(track_durations), 16, 24)))
+            elif child_type == 'trak':
+                children.append(rebuild(payload_start, box_end, 'trak', trak_count))
+                trak_count += 1
+            elif child_type == 'tkhd':
+                children.append(make_box(child_type, patch_duration(payload, track_durations[track_index], 20, 28)))
+                if track['last'] > track['first']:
+                    children.append(build_edit_list(track['segment_duration'], track['media_time'],
+                                                    track['empty_duration']))
+            elif child_type == 'edts':
+                # Replaced by the edit list written after tkhd
+                continue
+            elif child_type == 'mdhd':
+                children.append(make_box(child_type, patch_duration(payload, track['media_duration'], 16, 24)))
+            elif child_type in ('mdia', 'minf'):
+                children.append(rebuild(payload_start, box_end, child_type, track_index))
+            elif child_type == 'stbl':
+                children.append(build_sample_table(track, mdat_offset, use_co64))
+            else:
+                children.append(moov[box_start:box_end])
+        return make_box(box_type, b''.join(children))
+
+    return rebuild(8, len(moov), 'moov')
+
+def stream_pieces(session: requests.Session, url: str, cookies: dict, span: tuple[int, int], pieces: list,
+                  chunk_size: int, emit, max_retries: int = 3) -> None:
+    """Download one byte span and pass only the bytes inside pieces to emit(), resuming on errors."""
+    span_start, span_end = span
+    position = span_start
+    index = 0
+    retry_count = 0
+    while position < span_end:
+        headers = dict(RANGE_HEADERS, Range=f"bytes={position}-{span_end - 1}")
+        try:
+            with session.get(url, stream=True, cookies=cookies, headers=headers, timeout=60) as response:
+                if response.status_code != 206:
+                    raise ClipError(f"range request failed with status code {response.status_code}")
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    chunk_end = position + len(chunk)
+                    while index < len(pieces) and pieces[index][0] < chunk_end:
+                        piece_start, piece_end = pieces[index]
+                        low, high = max(piece_start, position), min(piece_end, chunk_end)
+                        if high > low:
+                            emit(chunk[low - position:high - position])
+                        if piece_end > chunk_end:
+                            break
+                        index += 1
+                    position = chunk_end
+                    if position >= span_end:
+                        break
+            if position < span_end:
+                raise requests.exceptions.ConnectionError("connection closed before the range was complete")
+        except requests.exceptions.RequestException as e:
+            retry_count += 1
+            if retry_count >= max_retries:
+                raise ClipError(f"network error after {max_retries} attempts: {e}")
+            wait_time = 2 ** retry_count
+            print(f"\n[WARNING] Network error: {e}")
+            print(f"Resuming at byte {position} in {wait_time} seconds... (attempt {retry_count + 1}/{max_retries})")
+            time.sleep(wait_time)
+
+def download_clip(url: str, cookies: dict, filename: str, start: float, end: float, chunk_size: int, verbose: bool,
+                  processors: list = None, fsync_policy: str = "none", write_buffer: int = 64 * 1024 * 1024) -> bool:
+    """Download only the samples between start and end (seconds) of a remote MP4 as a playable file.
+
+    The moov index is fetched with small Range requests, the requested time
+    span is mapped to sample byte ranges through the stbl tables and only
+    those ranges are downloaded. Returns True if the clip was written.
+    """
+    processors = processors or []
+    if not filename:
+        print("\n[ERROR] Filename is required for download.")
+        return False
+    chunk_size = chunk_size or 65536
+    session = create_session()
+    try:
+        if verbose:
+            print("[INFO] Fetching MP4 index (moov box)")
+        try:
+            ftyp, moov = fetch_mp4_index(session, url, cookies)
+            if find_box(moov, 8, len(moov), 'mvex'):
+                raise ClipError("fragmented MP4 files are not supported")
+            tracks = [parse_track(moov, (payload_start, box_end))
+                      for box_type, _, payload_start, box_end in iter_boxes(moov, 8, len(moov)) if box_type == 'trak']
+            if not tracks:
+                raise ClipError("MP4 file has no tracks")
+
+            clip_start = select_clip_samples(tracks, start, end)
+            pieces, mdat_size = layout_clip(tracks)
+            mdat_header = struct.pack('>I4s', 8 + mdat_size, b'mdat') if mdat_size + 8 <= 0xFFFFFFFF else \
+                struct.pack('>I4sQ', 1, b'mdat', 16 + mdat_size)
+            # The moov size only depends on the chunk offset box type, so size it first
+            use_co64 = False
+            mdat_offset = len(ftyp) + len(build_clip_moov(moov, tracks, 0, use_co64)) + len(mdat_header)
+            if mdat_offset + mdat_size > 0xFFFFFFFF:
+                use_co64 = True
+                mdat_offset = len(ftyp) + len(build_clip_moov(moov, tracks, 0, use_co64)) + len(mdat_header)
+            header = ftyp + build_clip_moov(moov, tracks, mdat_offset, use_co64) + mdat_header
+        except (struct.error, IndexError, ValueError) as e:
+            # Inconsistencies not caught by the explicit checks while parsing
+            raise ClipError(f"malformed MP4 index ({e})")
+
+        spans = []
+        for piece_start, piece_end in pieces:
+            if spans and piece_start - spans[-1][1] <= CLIP_MERGE_GAP:
+                spans[-1][1] = piece_end
+                spans[-1][2].append((piece_start, piece_end))
+            else:
+                spans.append([piece_start, piece_end, [(piece_start, piece_end)]])
+
+        if verbose:
+            print(f"[INFO] Clip starts at keyframe {format_timestamp(clip_start)}")
+            print(f"[INFO] Fetching {mdat_size / (1024*1024):.1f}MB of samples in {len(spans)} range request(s)")
+
+        success = False
+        try:
+            with WriteBehindWriter(filename, truncate=True, fsync_policy=fsync_policy,
+                                   max_buffered_bytes=write_buffer, chunk_size=chunk_size) as writer:
+                with tqdm(
+                    total=len(header) + mdat_size,
+                    unit='B',
+                    unit_scale=True,
+                    unit_divisor=1024,
+                    desc=filename,
+                    file=sys.stdout,
+                    bar_format='{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]'
+                ) as pbar:
+                    def emit(data: bytes) -> None:
+                        writer.write(data)
+                        feed_processors(processors, data)
+                        pbar.update(len(data))
+
+                    emit(header)
+                    for span_start, span_end, span_pieces in spans:
+                        stream_pieces(session, url, cookies, (span_start, span_end), span_pieces, chunk_size, emit)
+            success = True
+        finally:
+            # A partial clip must not be mistaken for a resumable full download
+            if not success and os.path.isfile(filename):
+                os.remove(filename)
+
+        print(f"\n{filename} downloaded successfully ({format_timestamp(clip_start)} - "
+              f"{format_timestamp(clip_start + max(t['presentation_duration'] / t['timescale'] for t in tracks if t['timescale']))}).")
+        if verbose:
+            print(f"[INFO] {writer.report()}")
+        if processors and not finish_processors(processors):
+            return False
+        return True
+    except ClipError as e:
+        print(f"\n[ERROR] Could not download clip: {e}")
+        return False
+    except requests.exceptions.RequestException as e:
+        print(f"\n[ERROR] Network error while downloading clip: {e}")
+        print("  - Check your internet connection")
+        print("  - Verify the video URL is accessible")
+        return False
+    except OSError as e:
+        print(f"\n[ERROR] Failed to write {filename}: {e}")
+        print("  - Check that there is enough free disk space")
+        print("  - Verify you have write permission for the output location")
+        return False
+    finally:
+        session.close()
+
+def main(video_id: str, output_file: str = None, chunk_size: int = 65536, verbose: bool = False, cookie_file: str = None,
+         pipe_commands: list = None, hash_algorithms: list = None, fsync_policy: str = "none",
+         write_buffer: int = 64 * 1024 * 1024, clip_start: float = None, clip_end: float = None) -> None:
+    """Main function to process video ID and download the video file.
+
+    If clip_start or clip_end (seconds) is given, only that time range is downloaded.
+    """
     drive_url = f'https://drive.google.com/u/0/get_video_info?docid={video_id}&drive_originator_app=303'
 
     # Load cookies from file if provided, else use empty dict
@@ -674,10 +1675,31 @@ def main(video_id: str, output_file: str = None, chunk_size: int = 65536, verbos
         if not os.path.splitext(filename)[1]:
             filename += '.mp4'  # Default to .mp4 if no extension
 
+    is_clip = clip_start is not None or clip_end is not None
+    if is_clip and not output_file:
+        # Keep clips apart from full downloads, which resume from any existing file of the same name
+        stem, extension = os.path.splitext(filename)
+        filename = f"{stem}_{format_clip_label(clip_start or 0.0)}-{format_clip_label(clip_end)}{extension}"
+        if os.path.exists(filename):
+            print(f"\n[ERROR] {filename} already exists.")
+            print("  - Use --output to choose a different name or to overwrite it")
+            return
+
     if video:
         if verbose:
             print(f"[INFO] Video found. Starting download...")
-        download_file(video, cookies, filename, chunk_size, verbose)
+        processors = build_processors(pipe_commands, hash_algorithms, verbose)
+        if not start_processors(processors):
+            return
+        if verbose and processors:
+            print(f"[INFO] Post-processing with: {', '.join(p.label for p in processors)}")
+        if is_clip:
+            succeeded = download_clip(video, cookies, filename, clip_start or 0.0, clip_end, chunk_size, verbose,
+                                      processors, fsync_policy, write_buffer)
+        else:
+            succeeded = download_file(video, cookies, filename, chunk_size, verbose, processors, fsync_policy, write_buffer)
+        if not succeeded:
+            abort_processors(processors)
     else:
         print("\n[ERROR] Unable to retrieve the video URL.")
         print("Possible reasons:")
@@ -697,9 +1719,17 @@ if __name__ == "__main__":
     parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose mode.")
     parser.add_argument("--cookie-file", type=str, help="Path to JSON file containing cookies for authentication.")
     parser.add_argument("--get-cookies", type=str, nargs='?', const="cookies.json", help="Automatically get cookies by opening browser. Optionally specify output file (default: cookies.json).")
+    parser.add_argument("--pipe-to", type=str, action="append", metavar="COMMAND", help="Stream the video into the stdin of COMMAND while downloading (e.g. \"ffmpeg -i pipe:0 -c copy -f hls out.m3u8\"). Can be repeated.")
+    parser.add_argument("--hash", type=str, action="append", choices=HASH_ALGORITHMS, metavar="ALGORITHM", help="Compute a checksum of the video while downloading (e.g. sha256). Can be repeated.")
+    parser.add_argument("--fsync", type=str, choices=FSYNC_POLICIES, default="none", help="When to fsync the output file: never, periodically (every 64MB) or once at the end. Default is none.")
+    parser.add_argument("--write-buffer", type=int, default=64, metavar="MB", help="Maximum data (in MB) buffered for the background disk writer before network reads wait. Default is 64MB.")
+    parser.add_argument("--start", type=parse_timestamp, metavar="TIME", help="Download only from this time (SS, MM:SS or HH:MM:SS). The clip starts at the preceding keyframe. MP4 only.")
+    parser.add_argument("--end", type=parse_timestamp, metavar="TIME", help="Download only up to this time (SS, MM:SS or HH:MM:SS). MP4 only.")
     parser.add_argument("--version", action="version", version="%(prog)s 1.0")
 
     args = parser.parse_args()
+    if args.start is not None and args.end is not None and args.end <= args.start:
+        parser.error("--end must be later than --start")
     
     # Handle --get-cookies flag (standalone cookie extraction)
     if args.get_cookies is not None:
@@ -713,4 +1743,5 @@ if __name__ == "__main__":
     if args.video_id is None:
         interactive_mode()
     else:
-        main(args.video_id, args.output, args.chunk_size, args.verbose, args.cookie_file)
+        main(args.video_id, args.output, args.chunk_size, args.verbose, args.cookie_file,
+             args.pipe_to, args.hash, args.fsync, args.write_buffer * 1024 * 1024, args.start, args.end)